@@ -10,10 +10,13 @@ import sys
 import json
 import sqlite3
 import hashlib
+import tempfile
+import time
 import argparse
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from html import escape
 
 try:
     import yaml
@@ -21,9 +24,26 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install pyyaml")
     sys.exit(1)
 
+# Use orjson for JSON fields when installed; it is optional
+try:
+    from orjson import loads as json_loads, JSONDecodeError
+except ImportError:
+    from json import loads as json_loads, JSONDecodeError
+
+# Prefer the libyaml-backed loader; fall back to pure Python if not compiled in
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Configuration
 CONFIG_FILE = "config.yaml"
 STATE_FILE = ".site_state.json"
+STATE_VERSION = 3  # Bump when the hash/fingerprint format changes
+HASH_CHUNK_SIZE = 1 << 20  # Read databases 1 MiB at a time when hashing
+# Characters str.strip() removes, for trimming the same way in SQL
+WHITESPACE_CHARS = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)
 
 
 def load_config():
@@ -33,27 +53,63 @@ def load_config():
         sys.exit(1)
 
     with open(CONFIG_FILE, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=Loader)
 
 
 def get_db_hash(db_path):
     """Get hash of database file to detect changes."""
     if not os.path.exists(db_path):
         return None
+    h = hashlib.blake2b(digest_size=16)
     with open(db_path, 'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
 
 
-def get_combined_hash(collections):
-    """Get combined hash of all databases."""
-    hashes = []
+def get_db_fingerprint(db_path):
+    """Get mtime/size fingerprint of database file to detect changes."""
+    try:
+        st = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def get_combined_hash(collections, verify_hash=False):
+    """Get combined hash of all databases, plus each database's own hash.
+
+    Uses cheap mtime/size fingerprints unless verify_hash is set, in which
+    case every database is content-hashed. Returns (combined, {name: hash}).
+    """
+    get_token = get_db_hash if verify_hash else get_db_fingerprint
+    h = hashlib.blake2b(digest_size=16)
+    individual_hashes = {}
     for collection in collections:
         db_path = collection['db_path']
-        db_hash = get_db_hash(db_path)
-        hashes.append(db_hash or "missing")
-
-    combined = "|".join(hashes)
-    return hashlib.md5(combined.encode()).hexdigest()
+        db_hash = get_token(db_path)
+        individual_hashes[collection['name']] = db_hash
+        h.update((db_hash or "missing").encode())
+        h.update(b"|")
+    return h.hexdigest(), individual_hashes
+
+
+def fingerprints_match(collections, state):
+    """Check stored per-database fingerprints against the files on disk.
+
+    Only stats each database, so an unchanged site is detected without
+    reading any database contents. individual_hashes always holds
+    fingerprints, whichever mode wrote the state.
+    """
+    stored = state.get('individual_hashes')
+    if state.get('state_version') != STATE_VERSION or not stored:
+        return False
+    if set(stored) != {collection['name'] for collection in collections}:
+        return False
+    for collection in collections:
+        if stored[collection['name']] != get_db_fingerprint(collection['db_path']):
+            return False
+    return True
 
 
 def load_state():
@@ -74,16 +130,51 @@ def parse_json_field(value):
     """Parse a JSON field, returning empty list if invalid."""
     if not value:
         return []
+    # Only arrays, objects and strings are worth handing to the parser
+    if not isinstance(value, str) or value.lstrip()[:1] not in ('[', '{', '"'):
+        return [value]
     try:
-        result = json.loads(value)
-        if isinstance(result, list):
-            return result
-        return [result]
-    except:
-        return [value] if value else []
+        result = json_loads(value)
+    except JSONDecodeError:
+        return [value]
+    if isinstance(result, list):
+        return result
+    return [result]
+
+
+def open_db(db_path, connections=None):
+    """Open a read-only SQLite connection tuned for aggregate scans.
+
+    If a connections dict is given, connections are cached in it by path and
+    reused across calls until the database file is replaced.
+    """
+    if connections is not None:
+        inode = os.stat(db_path).st_ino
+        cached = connections.get(db_path)
+        if cached is not None:
+            if cached[0] == inode:
+                return cached[1]
+            cached[1].close()
+
+    conn = sqlite3.connect(db_path, check_same_thread=connections is None)
+    conn.executescript("""
+        PRAGMA query_only = 1;
+        PRAGMA mmap_size = 268435456;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -65536;
+    """)
+    if connections is not None:
+        connections[db_path] = (inode, conn)
+    return conn
+
+
+def close_db(conn, connections=None):
+    """Close a connection from open_db unless it is cached for reuse."""
+    if connections is None:
+        conn.close()
 
 
-def get_books_stats(db_path):
+def get_books_stats(db_path, connections=None):
     """Get statistics from books database."""
     stats = {
         'available': False,
@@ -98,46 +189,45 @@ def get_books_stats(db_path):
         return stats
 
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = open_db(db_path, connections)
         cursor = conn.cursor()
 
-        # Total count
-        cursor.execute("SELECT COUNT(*) as count FROM books")
-        stats['total_count'] = cursor.fetchone()['count']
-
-        # Read count
-        cursor.execute("SELECT COUNT(*) as count FROM books WHERE read_status = 'read'")
-        stats['read_count'] = cursor.fetchone()['count']
-
-        # To-read count
-        cursor.execute("SELECT COUNT(*) as count FROM books WHERE read_status = 'to_read'")
-        stats['to_read_count'] = cursor.fetchone()['count']
-
-        # Average rating
-        cursor.execute("SELECT AVG(rating) as avg FROM books WHERE rating IS NOT NULL")
+        # Counts and average rating in a single scan
+        cursor.execute("""
+            SELECT COUNT(*) as count,
+                   COALESCE(SUM(read_status = 'read'), 0) as read_count,
+                   COALESCE(SUM(read_status = 'to_read'), 0) as to_read_count,
+                   AVG(rating) as avg
+            FROM books
+        """)
         result = cursor.fetchone()
-        if result['avg']:
-            stats['avg_rating'] = round(result['avg'], 1)
+        stats['total_count'] = result[0]
+        stats['read_count'] = result[1]
+        stats['to_read_count'] = result[2]
+        if result[3]:
+            stats['avg_rating'] = round(result[3], 1)
 
         # Recent items
         cursor.execute("""
-            SELECT title, authors, rating, date_added
+            SELECT title, authors, rating
             FROM books
             ORDER BY date_added DESC
             LIMIT 5
         """)
-        stats['recent_items'] = [dict(row) for row in cursor.fetchall()]
+        stats['recent_items'] = [
+            {'title': title, 'authors': authors, 'rating': rating}
+            for title, authors, rating in cursor.fetchall()
+        ]
 
         stats['available'] = True
-        conn.close()
+        close_db(conn, connections)
     except Exception as e:
-        print(f"Warning: Could not read books database: {e}")
+        stats['error'] = f"Could not read books database: {e}"
 
     return stats
 
 
-def get_albums_stats(db_path):
+def get_albums_stats(db_path, connections=None):
     """Get statistics from albums database."""
     stats = {
         'available': False,
@@ -151,52 +241,58 @@ def get_albums_stats(db_path):
         return stats
 
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = open_db(db_path, connections)
         cursor = conn.cursor()
 
-        # Total count
-        cursor.execute("SELECT COUNT(*) as count FROM albums")
-        stats['total_count'] = cursor.fetchone()['count']
-
-        # Artist count (unique)
-        cursor.execute("SELECT DISTINCT artists FROM albums WHERE artists IS NOT NULL")
-        artists_set = set()
-        for row in cursor.fetchall():
-            artists_list = parse_json_field(row['artists'])
-            for artist in artists_list:
-                if artist and artist.strip():
-                    artists_set.add(artist.strip())
-        stats['artist_count'] = len(artists_set)
-
-        # Average rating
-        cursor.execute("SELECT AVG(rating) as avg FROM albums WHERE rating IS NOT NULL")
+        # Count and average rating in a single scan
+        cursor.execute("SELECT COUNT(*) as count, AVG(rating) as avg FROM albums")
         result = cursor.fetchone()
-        if result['avg']:
-            stats['avg_rating'] = round(result['avg'], 1)
+        stats['total_count'] = result[0]
+        if result[1]:
+            stats['avg_rating'] = round(result[1], 1)
+
+        # Artist count (unique), using SQLite's JSON1 functions when available
+        try:
+            cursor.execute("""
+                SELECT COUNT(DISTINCT trim(j.value, :ws)) as count
+                FROM albums, json_each(
+                    CASE WHEN json_valid(albums.artists) THEN albums.artists
+                         ELSE json_array(albums.artists) END) j
+                WHERE j.value IS NOT NULL AND trim(j.value, :ws) != ''
+            """, {'ws': WHITESPACE_CHARS})
+            stats['artist_count'] = cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            cursor.execute("SELECT DISTINCT artists FROM albums WHERE artists IS NOT NULL")
+            artists_set = set()
+            for row in cursor.fetchall():
+                artists_list = parse_json_field(row[0])
+                for artist in artists_list:
+                    if artist and artist.strip():
+                        artists_set.add(artist.strip())
+            stats['artist_count'] = len(artists_set)
 
         # Recent items
         cursor.execute("""
-            SELECT album_name, artists, genre, rating, date_added
+            SELECT album_name, artists, rating
             FROM albums
             ORDER BY date_added DESC
             LIMIT 5
         """)
-        rows = cursor.fetchall()
-        for row in rows:
-            item = dict(row)
-            item['artists_list'] = parse_json_field(row['artists'])
-            stats['recent_items'].append(item)
+        stats['recent_items'] = [
+            {'album_name': album_name, 'artists': artists,
+             'artists_list': parse_json_field(artists), 'rating': rating}
+            for album_name, artists, rating in cursor.fetchall()
+        ]
 
         stats['available'] = True
-        conn.close()
+        close_db(conn, connections)
     except Exception as e:
-        print(f"Warning: Could not read albums database: {e}")
+        stats['error'] = f"Could not read albums database: {e}"
 
     return stats
 
 
-def get_shows_stats(db_path):
+def get_shows_stats(db_path, connections=None):
     """Get statistics from shows database."""
     stats = {
         'available': False,
@@ -212,31 +308,25 @@ def get_shows_stats(db_path):
         return stats
 
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = open_db(db_path, connections)
         cursor = conn.cursor()
 
-        # Total count
-        cursor.execute("SELECT COUNT(*) as count FROM shows")
-        stats['total_count'] = cursor.fetchone()['count']
-
-        # Seen count
-        cursor.execute("SELECT COUNT(*) as count FROM shows WHERE seen_status = 'seen'")
-        stats['seen_count'] = cursor.fetchone()['count']
-
-        # Wishlist count
-        cursor.execute("SELECT COUNT(*) as count FROM shows WHERE seen_status = 'wishlist'")
-        stats['wishlist_count'] = cursor.fetchone()['count']
-
-        # Theater count
-        cursor.execute("SELECT COUNT(DISTINCT theater_name) as count FROM shows WHERE theater_name IS NOT NULL")
-        stats['theater_count'] = cursor.fetchone()['count']
-
-        # Average rating
-        cursor.execute("SELECT AVG(rating) as avg FROM shows WHERE rating IS NOT NULL AND seen_status = 'seen'")
+        # Counts and average rating in a single scan
+        cursor.execute("""
+            SELECT COUNT(*) as count,
+                   COALESCE(SUM(seen_status = 'seen'), 0) as seen_count,
+                   COALESCE(SUM(seen_status = 'wishlist'), 0) as wishlist_count,
+                   COUNT(DISTINCT theater_name) as theater_count,
+                   AVG(CASE WHEN seen_status = 'seen' THEN rating END) as avg
+            FROM shows
+        """)
         result = cursor.fetchone()
-        if result['avg']:
-            stats['avg_rating'] = round(result['avg'], 1)
+        stats['total_count'] = result[0]
+        stats['seen_count'] = result[1]
+        stats['wishlist_count'] = result[2]
+        stats['theater_count'] = result[3]
+        if result[4]:
+            stats['avg_rating'] = round(result[4], 1)
 
         # Recent items
         cursor.execute("""
@@ -246,17 +336,21 @@ def get_shows_stats(db_path):
             ORDER BY date_attended DESC
             LIMIT 5
         """)
-        stats['recent_items'] = [dict(row) for row in cursor.fetchall()]
+        stats['recent_items'] = [
+            {'show_name': show_name, 'theater_name': theater_name,
+             'date_attended': date_attended, 'rating': rating}
+            for show_name, theater_name, date_attended, rating in cursor.fetchall()
+        ]
 
         stats['available'] = True
-        conn.close()
+        close_db(conn, connections)
     except Exception as e:
-        print(f"Warning: Could not read shows database: {e}")
+        stats['error'] = f"Could not read shows database: {e}"
 
     return stats
 
 
-def get_restaurants_stats(db_path):
+def get_restaurants_stats(db_path, connections=None):
     """Get statistics from restaurants database."""
     stats = {
         'available': False,
@@ -272,49 +366,56 @@ def get_restaurants_stats(db_path):
         return stats
 
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = open_db(db_path, connections)
         cursor = conn.cursor()
 
-        # Total count
-        cursor.execute("SELECT COUNT(*) as count FROM restaurants")
-        stats['total_count'] = cursor.fetchone()['count']
-
-        # Visited count
-        cursor.execute("SELECT COUNT(*) as count FROM restaurants WHERE visit_status = 'visited'")
-        stats['visited_count'] = cursor.fetchone()['count']
-
-        # Wishlist count
-        cursor.execute("SELECT COUNT(*) as count FROM restaurants WHERE visit_status = 'want_to_visit'")
-        stats['wishlist_count'] = cursor.fetchone()['count']
-
-        # Location count
-        cursor.execute("SELECT COUNT(DISTINCT location) as count FROM restaurants WHERE location IS NOT NULL")
-        stats['location_count'] = cursor.fetchone()['count']
-
-        # Average rating
-        cursor.execute("SELECT AVG(rating) as avg FROM restaurants WHERE rating IS NOT NULL AND visit_status = 'visited'")
+        # Counts and average rating in a single scan
+        cursor.execute("""
+            SELECT COUNT(*) as count,
+                   COALESCE(SUM(visit_status = 'visited'), 0) as visited_count,
+                   COALESCE(SUM(visit_status = 'want_to_visit'), 0) as wishlist_count,
+                   COUNT(DISTINCT location) as location_count,
+                   AVG(CASE WHEN visit_status = 'visited' THEN rating END) as avg
+            FROM restaurants
+        """)
         result = cursor.fetchone()
-        if result['avg']:
-            stats['avg_rating'] = round(result['avg'], 1)
+        stats['total_count'] = result[0]
+        stats['visited_count'] = result[1]
+        stats['wishlist_count'] = result[2]
+        stats['location_count'] = result[3]
+        if result[4]:
+            stats['avg_rating'] = round(result[4], 1)
 
         # Recent items
         cursor.execute("""
-            SELECT restaurant_name, location, cuisine, rating, date_added
+            SELECT restaurant_name, location, cuisine, rating
             FROM restaurants
             ORDER BY date_added DESC
             LIMIT 5
         """)
-        stats['recent_items'] = [dict(row) for row in cursor.fetchall()]
+        stats['recent_items'] = [
+            {'restaurant_name': restaurant_name, 'location': location,
+             'cuisine': cuisine, 'rating': rating}
+            for restaurant_name, location, cuisine, rating in cursor.fetchall()
+        ]
 
         stats['available'] = True
-        conn.close()
+        close_db(conn, connections)
     except Exception as e:
-        print(f"Warning: Could not read restaurants database: {e}")
+        stats['error'] = f"Could not read restaurants database: {e}"
 
     return stats
 
 
+# Statistics readers, keyed by collection db_table
+STATS_DISPATCH = {
+    'books': get_books_stats,
+    'albums': get_albums_stats,
+    'shows': get_shows_stats,
+    'restaurants': get_restaurants_stats,
+}
+
+
 def calculate_aggregate_stats(collections_stats):
     """Calculate aggregate statistics across all collections."""
     total_items = sum(stats.get('total_count', 0) for stats in collections_stats.values())
@@ -334,6 +435,20 @@ def calculate_aggregate_stats(collections_stats):
     }
 
 
+HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+
+def escape_html(s):
+    """Escape text for HTML in a single pass (same output as html.escape)."""
+    return s.translate(HTML_ESCAPE_TABLE) if s else ''
+
+
 def generate_star_rating(rating, max_rating=10):
     """Generate star rating HTML."""
     if not rating:
@@ -345,145 +460,168 @@ def generate_star_rating(rating, max_rating=10):
     return f'<span class="rating">{stars}</span> <span style="font-size: 0.9rem;">{rating}/{max_rating}</span>'
 
 
-def generate_recent_item_card(item, collection_name):
-    """Generate HTML for a recent item mini card."""
-    html = '<div class="recent-item">'
-
-    if collection_name == "Books":
-        title = escape(item.get('title', 'Unknown'))
-        authors = escape(item.get('authors', 'Unknown'))
-        rating = item.get('rating')
-        html += f'<div class="recent-item-title">{title}</div>'
-        html += f'<div class="recent-item-meta">{authors}</div>'
-        if rating:
-            html += f'<div class="recent-item-rating">{generate_star_rating(rating)}</div>'
-
-    elif collection_name == "Albums":
-        album = escape(item.get('album_name', 'Unknown'))
-        artists = item.get('artists_list', [])
-        artist_str = ", ".join(artists) if artists else item.get('artists', 'Unknown')
-        rating = item.get('rating')
-        html += f'<div class="recent-item-title">{album}</div>'
-        html += f'<div class="recent-item-meta">{escape(artist_str)}</div>'
-        if rating:
-            html += f'<div class="recent-item-rating">{generate_star_rating(rating)}</div>'
-
-    elif collection_name == "Broadway Shows":
-        show = escape(item.get('show_name', 'Unknown'))
-        theater = escape(item.get('theater_name', 'Unknown'))
-        date = item.get('date_attended', '')
-        rating = item.get('rating')
-        html += f'<div class="recent-item-title">{show}</div>'
-        html += f'<div class="recent-item-meta">{theater}'
-        if date:
-            html += f' • {date}'
-        html += '</div>'
-        if rating:
-            html += f'<div class="recent-item-rating">{generate_star_rating(rating)}</div>'
-
-    elif collection_name == "Restaurants":
-        restaurant = escape(item.get('restaurant_name', 'Unknown'))
-        location = escape(item.get('location', 'Unknown'))
-        cuisine = escape(item.get('cuisine', ''))
-        rating = item.get('rating')
-        html += f'<div class="recent-item-title">{restaurant}</div>'
-        html += f'<div class="recent-item-meta">{location}'
-        if cuisine:
-            html += f' • {cuisine}'
-        html += '</div>'
-        if rating:
-            html += f'<div class="recent-item-rating">{generate_star_rating(rating)}</div>'
-
-    html += '</div>'
-    return html
-
-
-def generate_collection_card(collection, stats, config):
-    """Generate HTML for a collection card."""
-    name = collection['name']
-    emoji = collection['emoji']
-    accent_color = collection['accent_color']
-
-    # Determine link path based on deployment mode
-    deployment_mode = config.get('deployment_mode', 'file')
-    if deployment_mode == 'http':
-        link_path = collection['site_path_http']
+def generate_book_recent_item(item):
+    """Generate HTML for a recent book mini card."""
+    title = escape_html(item['title'])
+    authors = escape_html(item['authors'])
+    rating = item['rating']
+    parts = ['<div class="recent-item">']
+    parts.append(f'<div class="recent-item-title">{title}</div>')
+    parts.append(f'<div class="recent-item-meta">{authors}</div>')
+    if rating:
+        parts.append(f'<div class="recent-item-rating">{generate_star_rating(rating)}</div>')
+    parts.append('</div>')
+    return ''.join(parts)
+
+
+def generate_album_recent_item(item):
+    """Generate HTML for a recent album mini card."""
+    album = escape_html(item['album_name'])
+    artists = item['artists_list']
+    artist_str = ", ".join(artists) if artists else item['artists']
+    rating = item['rating']
+    parts = ['<div class="recent-item">']
+    parts.append(f'<div class="recent-item-title">{album}</div>')
+    parts.append(f'<div class="recent-item-meta">{escape_html(artist_str)}</div>')
+    if rating:
+        parts.append(f'<div class="recent-item-rating">{generate_star_rating(rating)}</div>')
+    parts.append('</div>')
+    return ''.join(parts)
+
+
+def generate_show_recent_item(item):
+    """Generate HTML for a recent show mini card."""
+    show = escape_html(item['show_name'])
+    theater = escape_html(item['theater_name'])
+    date = item['date_attended']
+    rating = item['rating']
+    parts = ['<div class="recent-item">']
+    parts.append(f'<div class="recent-item-title">{show}</div>')
+    parts.append(f'<div class="recent-item-meta">{theater}')
+    if date:
+        parts.append(f' • {date}')
+    parts.append('</div>')
+    if rating:
+        parts.append(f'<div class="recent-item-rating">{generate_star_rating(rating)}</div>')
+    parts.append('</div>')
+    return ''.join(parts)
+
+
+def generate_restaurant_recent_item(item):
+    """Generate HTML for a recent restaurant mini card."""
+    restaurant = escape_html(item['restaurant_name'])
+    location = escape_html(item['location'])
+    cuisine = escape_html(item['cuisine'])
+    rating = item['rating']
+    parts = ['<div class="recent-item">']
+    parts.append(f'<div class="recent-item-title">{restaurant}</div>')
+    parts.append(f'<div class="recent-item-meta">{location}')
+    if cuisine:
+        parts.append(f' • {cuisine}')
+    parts.append('</div>')
+    if rating:
+        parts.append(f'<div class="recent-item-rating">{generate_star_rating(rating)}</div>')
+    parts.append('</div>')
+    return ''.join(parts)
+
+
+def generate_empty_recent_item(item):
+    """Generate HTML for a recent item of an unknown collection."""
+    return '<div class="recent-item"></div>'
+
+
+# Recent item renderers, keyed by collection name
+RECENT_ITEM_RENDERERS = {
+    'Books': generate_book_recent_item,
+    'Albums': generate_album_recent_item,
+    'Broadway Shows': generate_show_recent_item,
+    'Restaurants': generate_restaurant_recent_item,
+}
+
+# Statistics shown on each collection card as (stats key, label); the
+# average rating is appended when available
+COLLECTION_STAT_FIELDS = {
+    'Books': (('total_count', 'Total Books'), ('read_count', 'Read'), ('to_read_count', 'To Read')),
+    'Albums': (('total_count', 'Albums'), ('artist_count', 'Artists')),
+    'Broadway Shows': (('total_count', 'Total Shows'), ('seen_count', 'Seen'), ('wishlist_count', 'Wishlist')),
+    'Restaurants': (('total_count', 'Restaurants'), ('visited_count', 'Visited'), ('wishlist_count', 'Wishlist')),
+}
+
+
+# Per-collection values needed to render a collection card
+ResolvedCollection = namedtuple('ResolvedCollection', 'name emoji accent_color link_path')
+
+
+def resolve_collections(config):
+    """Resolve the per-collection values needed to render the page.
+
+    Returns a ResolvedCollection per collection, with link_path chosen once
+    for the deployment mode.
+    """
+    if config.get('deployment_mode', 'file') == 'http':
+        link_key = 'site_path_http'
     else:
-        link_path = collection['site_path_file']
+        link_key = 'site_path_file'
+    return [
+        ResolvedCollection(collection['name'], collection['emoji'],
+                           collection['accent_color'], collection[link_key])
+        for collection in config['collections']
+    ]
 
-    html = f'<div class="collection-card" style="--collection-accent: {accent_color};">'
-    html += f'<div class="collection-header">'
-    html += f'<span class="collection-emoji">{emoji}</span>'
-    html += f'<h2 class="collection-name">{escape(name)}</h2>'
-    html += '</div>'
+
+def generate_collection_card(collection, stats, site_config):
+    """Generate HTML for a collection card from a ResolvedCollection."""
+    name, emoji, accent_color, link_path = collection
+
+    parts = [f'<div class="collection-card" style="--collection-accent: {accent_color};">']
+    parts.append(f'<div class="collection-header">')
+    parts.append(f'<span class="collection-emoji">{emoji}</span>')
+    parts.append(f'<h2 class="collection-name">{escape_html(name)}</h2>')
+    parts.append('</div>')
 
     if not stats['available']:
-        html += '<div class="collection-unavailable">Database not available</div>'
+        parts.append('<div class="collection-unavailable">Database not available</div>')
     else:
         # Statistics section
-        html += '<div class="collection-stats">'
-
-        if name == "Books":
-            html += f'<div class="stat-item"><span class="stat-value">{stats["total_count"]}</span><span class="stat-label">Total Books</span></div>'
-            html += f'<div class="stat-item"><span class="stat-value">{stats["read_count"]}</span><span class="stat-label">Read</span></div>'
-            html += f'<div class="stat-item"><span class="stat-value">{stats["to_read_count"]}</span><span class="stat-label">To Read</span></div>'
-            if stats['avg_rating']:
-                html += f'<div class="stat-item"><span class="stat-value">{stats["avg_rating"]}</span><span class="stat-label">Avg Rating</span></div>'
-
-        elif name == "Albums":
-            html += f'<div class="stat-item"><span class="stat-value">{stats["total_count"]}</span><span class="stat-label">Albums</span></div>'
-            html += f'<div class="stat-item"><span class="stat-value">{stats["artist_count"]}</span><span class="stat-label">Artists</span></div>'
-            if stats['avg_rating']:
-                html += f'<div class="stat-item"><span class="stat-value">{stats["avg_rating"]}</span><span class="stat-label">Avg Rating</span></div>'
-
-        elif name == "Broadway Shows":
-            html += f'<div class="stat-item"><span class="stat-value">{stats["total_count"]}</span><span class="stat-label">Total Shows</span></div>'
-            html += f'<div class="stat-item"><span class="stat-value">{stats["seen_count"]}</span><span class="stat-label">Seen</span></div>'
-            html += f'<div class="stat-item"><span class="stat-value">{stats["wishlist_count"]}</span><span class="stat-label">Wishlist</span></div>'
-            if stats['avg_rating']:
-                html += f'<div class="stat-item"><span class="stat-value">{stats["avg_rating"]}</span><span class="stat-label">Avg Rating</span></div>'
-
-        elif name == "Restaurants":
-            html += f'<div class="stat-item"><span class="stat-value">{stats["total_count"]}</span><span class="stat-label">Restaurants</span></div>'
-            html += f'<div class="stat-item"><span class="stat-value">{stats["visited_count"]}</span><span class="stat-label">Visited</span></div>'
-            html += f'<div class="stat-item"><span class="stat-value">{stats["wishlist_count"]}</span><span class="stat-label">Wishlist</span></div>'
-            if stats['avg_rating']:
-                html += f'<div class="stat-item"><span class="stat-value">{stats["avg_rating"]}</span><span class="stat-label">Avg Rating</span></div>'
-
-        html += '</div>'
+        parts.append('<div class="collection-stats">')
+
+        stat_fields = COLLECTION_STAT_FIELDS.get(name, ())
+        for key, label in stat_fields:
+            parts.append(f'<div class="stat-item"><span class="stat-value">{stats[key]}</span><span class="stat-label">{label}</span></div>')
+        if stat_fields and stats['avg_rating']:
+            parts.append(f'<div class="stat-item"><span class="stat-value">{stats["avg_rating"]}</span><span class="stat-label">Avg Rating</span></div>')
+
+        parts.append('</div>')
 
         # Recent items section
-        if stats['recent_items'] and config['site'].get('show_recent_items', True):
-            html += '<div class="recent-section">'
-            html += '<h3 class="recent-title">Recently Added</h3>'
-            html += '<div class="recent-items">'
-            for item in stats['recent_items'][:config['site'].get('recent_items_count', 5)]:
-                html += generate_recent_item_card(item, name)
-            html += '</div>'
-            html += '</div>'
+        if stats['recent_items'] and site_config.get('show_recent_items', True):
+            parts.append('<div class="recent-section">')
+            parts.append('<h3 class="recent-title">Recently Added</h3>')
+            parts.append('<div class="recent-items">')
+            render_recent_item = RECENT_ITEM_RENDERERS.get(name, generate_empty_recent_item)
+            for item in stats['recent_items'][:site_config.get('recent_items_count', 5)]:
+                parts.append(render_recent_item(item))
+            parts.append('</div>')
+            parts.append('</div>')
 
     # Browse button
-    html += f'<a href="{link_path}" class="browse-button">Browse {escape(name)} →</a>'
-    html += '</div>'
+    parts.append(f'<a href="{link_path}" class="browse-button">Browse {escape_html(name)} →</a>')
+    parts.append('</div>')
 
-    return html
+    return ''.join(parts)
 
 
-def generate_html(config, collections_stats, aggregate_stats):
-    """Generate complete HTML page."""
-    site_config = config['site']
-    title = site_config['title']
-    subtitle = site_config.get('subtitle', '')
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-    html = f'''<!DOCTYPE html>
+# Page template. The CSS is static; only the head/body/footer fields are formatted.
+PAGE_HEAD = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{escape(title)}</title>
-    <style>
-        :root {{
+    <title>{title}</title>
+'''
+
+PAGE_CSS = '''    <style>
+        :root {
             --primary: #6366f1;
             --text: #2c3e50;
             --text-muted: #7f8c8d;
@@ -491,11 +629,11 @@ def generate_html(config, collections_stats, aggregate_stats):
             --bg-card: #f8f9fa;
             --border: #e0e0e0;
             --border-light: #f0f0f0;
-        }}
+        }
 
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        * { margin: 0; padding: 0; box-sizing: border-box; }
 
-        body {{
+        body {
             font-family: Georgia, serif;
             line-height: 1.6;
             color: var(--text);
@@ -503,29 +641,29 @@ def generate_html(config, collections_stats, aggregate_stats):
             padding: 2rem;
             max-width: 1400px;
             margin: 0 auto;
-        }}
+        }
 
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 3rem;
             padding-bottom: 2rem;
             border-bottom: 2px solid var(--border);
-        }}
+        }
 
-        h1 {{
+        h1 {
             font-size: 2.5rem;
             color: var(--primary);
             font-weight: normal;
             margin-bottom: 0.5rem;
-        }}
+        }
 
-        .subtitle {{
+        .subtitle {
             font-size: 1.1rem;
             color: var(--text-muted);
             font-style: italic;
-        }}
+        }
 
-        .aggregate-stats {{
+        .aggregate-stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 2rem;
@@ -534,88 +672,88 @@ def generate_html(config, collections_stats, aggregate_stats):
             background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%);
             border-radius: 8px;
             border: 1px solid var(--border-light);
-        }}
+        }
 
-        .aggregate-stat {{
+        .aggregate-stat {
             text-align: center;
-        }}
+        }
 
-        .aggregate-stat-value {{
+        .aggregate-stat-value {
             font-size: 3rem;
             color: var(--primary);
             font-weight: normal;
             font-family: Georgia, serif;
-        }}
+        }
 
-        .aggregate-stat-label {{
+        .aggregate-stat-label {
             font-size: 0.9rem;
             color: var(--text-muted);
             text-transform: uppercase;
             letter-spacing: 0.05em;
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
             margin-top: 0.5rem;
-        }}
+        }
 
-        .collections {{
+        .collections {
             display: grid;
             gap: 2rem;
-        }}
+        }
 
-        .collection-card {{
+        .collection-card {
             background: var(--bg-card);
             border: 2px solid var(--border);
             border-radius: 8px;
             padding: 2rem;
             transition: all 0.2s ease;
-        }}
+        }
 
-        .collection-card:hover {{
+        .collection-card:hover {
             border-color: var(--collection-accent);
             box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-        }}
+        }
 
-        .collection-header {{
+        .collection-header {
             display: flex;
             align-items: center;
             gap: 1rem;
             margin-bottom: 1.5rem;
             padding-bottom: 1rem;
             border-bottom: 2px solid var(--collection-accent);
-        }}
+        }
 
-        .collection-emoji {{
+        .collection-emoji {
             font-size: 2.5rem;
-        }}
+        }
 
-        .collection-name {{
+        .collection-name {
             font-size: 1.8rem;
             font-weight: normal;
             color: var(--collection-accent);
-        }}
+        }
 
-        .collection-stats {{
+        .collection-stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
             gap: 1.5rem;
             margin-bottom: 2rem;
-        }}
+        }
 
-        .stat-item {{
+        .stat-item {
             text-align: center;
             padding: 1rem;
             background: var(--bg);
             border-radius: 6px;
-        }}
+        }
 
-        .stat-value {{
+        .stat-value {
             display: block;
             font-size: 2rem;
             color: var(--collection-accent);
             font-weight: normal;
             font-family: Georgia, serif;
-        }}
+        }
 
-        .stat-label {{
+        .stat-label {
             display: block;
             font-size: 0.8rem;
             color: var(--text-muted);
@@ -623,64 +761,64 @@ def generate_html(config, collections_stats, aggregate_stats):
             letter-spacing: 0.05em;
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
             margin-top: 0.5rem;
-        }}
+        }
 
-        .recent-section {{
+        .recent-section {
             margin-bottom: 2rem;
-        }}
+        }
 
-        .recent-title {{
+        .recent-title {
             font-size: 1.2rem;
             color: var(--text);
             margin-bottom: 1rem;
             font-weight: 600;
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-        }}
+        }
 
-        .recent-items {{
+        .recent-items {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 1rem;
-        }}
+        }
 
-        .recent-item {{
+        .recent-item {
             background: var(--bg);
             padding: 1rem;
             border: 1px solid var(--border);
             border-radius: 6px;
             transition: all 0.2s ease;
-        }}
+        }
 
-        .recent-item:hover {{
+        .recent-item:hover {
             border-color: var(--collection-accent);
             box-shadow: 0 2px 6px rgba(0,0,0,0.05);
-        }}
+        }
 
-        .recent-item-title {{
+        .recent-item-title {
             font-size: 1rem;
             font-weight: 600;
             margin-bottom: 0.5rem;
             color: var(--text);
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-        }}
+        }
 
-        .recent-item-meta {{
+        .recent-item-meta {
             font-size: 0.9rem;
             color: var(--text-muted);
             font-style: italic;
             margin-bottom: 0.5rem;
-        }}
+        }
 
-        .recent-item-rating {{
+        .recent-item-rating {
             font-size: 0.85rem;
             color: var(--collection-accent);
-        }}
+        }
 
-        .rating {{
+        .rating {
             color: var(--collection-accent);
-        }}
+        }
 
-        .browse-button {{
+        .browse-button {
             display: inline-block;
             background: var(--collection-accent);
             color: white;
@@ -691,14 +829,14 @@ def generate_html(config, collections_stats, aggregate_stats):
             font-weight: 600;
             font-size: 1rem;
             transition: all 0.2s ease;
-        }}
+        }
 
-        .browse-button:hover {{
+        .browse-button:hover {
             opacity: 0.9;
             transform: translateX(4px);
-        }}
+        }
 
-        .collection-unavailable {{
+        .collection-unavailable {
             padding: 2rem;
             text-align: center;
             color: var(--text-muted);
@@ -706,9 +844,9 @@ def generate_html(config, collections_stats, aggregate_stats):
             background: var(--bg);
             border-radius: 6px;
             margin-bottom: 1rem;
-        }}
+        }
 
-        footer {{
+        footer {
             margin-top: 4rem;
             padding-top: 2rem;
             border-top: 1px solid var(--border);
@@ -716,31 +854,57 @@ def generate_html(config, collections_stats, aggregate_stats):
             font-size: 0.85rem;
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
             text-align: center;
-        }}
-
-        @media (max-width: 768px) {{
-            body {{ padding: 1rem; }}
-            h1 {{ font-size: 2rem; }}
-            .collection-stats {{ grid-template-columns: repeat(2, 1fr); }}
-            .recent-items {{ grid-template-columns: 1fr; }}
-            .aggregate-stats {{ grid-template-columns: 1fr; }}
-        }}
+        }
+
+        @media (max-width: 768px) {
+            body { padding: 1rem; }
+            h1 { font-size: 2rem; }
+            .collection-stats { grid-template-columns: repeat(2, 1fr); }
+            .recent-items { grid-template-columns: 1fr; }
+            .aggregate-stats { grid-template-columns: 1fr; }
+        }
     </style>
-</head>
+'''
+
+PAGE_BODY_OPEN = '''</head>
 <body>
     <div class="header">
-        <h1>{escape(title)}</h1>'''
+        <h1>{title}</h1>'''
+
+PAGE_FOOTER = '''
+    </div>
+
+    <footer>
+        Generated on {timestamp}
+    </footer>
+</body>
+</html>'''
+
+
+def generate_html(config, collections_stats, aggregate_stats):
+    """Generate complete HTML page."""
+    site_config = config['site']
+    title = site_config['title']
+    subtitle = site_config.get('subtitle', '')
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+    escaped_title = escape_html(title)
+    parts = [
+        PAGE_HEAD.format(title=escaped_title),
+        PAGE_CSS,
+        PAGE_BODY_OPEN.format(title=escaped_title),
+    ]
 
     if subtitle:
-        html += f'\n        <div class="subtitle">{escape(subtitle)}</div>'
+        parts.append(f'\n        <div class="subtitle">{escape_html(subtitle)}</div>')
 
-    html += '''
+    parts.append('''
     </div>
 
-    <div class="aggregate-stats">'''
+    <div class="aggregate-stats">''')
 
     # Aggregate statistics
-    html += f'''
+    parts.append(f'''
         <div class="aggregate-stat">
             <div class="aggregate-stat-value">{aggregate_stats["total_items"]}</div>
             <div class="aggregate-stat-label">Total Items</div>
@@ -748,80 +912,87 @@ def generate_html(config, collections_stats, aggregate_stats):
         <div class="aggregate-stat">
             <div class="aggregate-stat-value">{aggregate_stats["collection_count"]}</div>
             <div class="aggregate-stat-label">Collections</div>
-        </div>'''
+        </div>''')
 
     if aggregate_stats['overall_avg_rating']:
-        html += f'''
+        parts.append(f'''
         <div class="aggregate-stat">
             <div class="aggregate-stat-value">{aggregate_stats["overall_avg_rating"]}</div>
             <div class="aggregate-stat-label">Overall Avg Rating</div>
-        </div>'''
+        </div>''')
 
-    html += '''
+    parts.append('''
     </div>
 
-    <div class="collections">'''
+    <div class="collections">''')
 
     # Collection cards
-    for collection in config['collections']:
-        collection_name = collection['name']
-        stats = collections_stats.get(collection_name, {})
-        html += generate_collection_card(collection, stats, config)
+    for collection in resolve_collections(config):
+        stats = collections_stats.get(collection.name, {})
+        parts.append(generate_collection_card(collection, stats, site_config))
 
-    html += f'''
-    </div>
+    parts.append(PAGE_FOOTER.format(timestamp=timestamp))
 
-    <footer>
-        Generated on {timestamp}
-    </footer>
-</body>
-</html>'''
+    return ''.join(parts)
 
-    return html
 
-
-def generate_site(config, force=False):
+def generate_site(config, force=False, verify_hash=False, connections=None):
     """Main site generation function."""
     collections = config['collections']
 
-    # Check if regeneration is needed
-    current_hash = get_combined_hash(collections)
+    # Check if regeneration is needed. Without --verify-hash this only stats
+    # each database and compares against the stored fingerprints.
     state = load_state()
+    content_hash = get_combined_hash(collections, verify_hash=True)[0] if verify_hash else None
+    if force:
+        up_to_date = False
+    elif verify_hash:
+        up_to_date = (state.get('state_version') == STATE_VERSION
+                      and state.get('content_hash') == content_hash)
+    else:
+        up_to_date = fingerprints_match(collections, state)
 
-    if not force and state.get('databases_hash') == current_hash:
+    if up_to_date:
         print("✓ No database changes detected. Site is up to date.")
         print(f"  Use --force to regenerate anyway.")
         return False
 
+    # Stored per-database hashes are always fingerprints; content hashing
+    # only adds a combined content_hash alongside them
+    current_hash, individual_hashes = get_combined_hash(collections)
+
     print("Generating top-level site...")
 
-    # Gather statistics from all collections
+    # Gather statistics from all collections, reading databases in parallel;
+    # results are collected and reported in config order
     collections_stats = {}
-    for collection in collections:
-        name = collection['name']
-        db_path = collection['db_path']
-        db_table = collection['db_table']
-
-        print(f"  Reading {name} database...")
-
-        if db_table == 'books':
-            stats = get_books_stats(db_path)
-        elif db_table == 'albums':
-            stats = get_albums_stats(db_path)
-        elif db_table == 'shows':
-            stats = get_shows_stats(db_path)
-        elif db_table == 'restaurants':
-            stats = get_restaurants_stats(db_path)
-        else:
-            print(f"    Warning: Unknown collection type '{db_table}'")
-            stats = {'available': False}
-
-        collections_stats[name] = stats
-
-        if stats['available']:
-            print(f"    ✓ Found {stats.get('total_count', 0)} items")
-        else:
-            print(f"    ⚠ Database not available")
+    with ThreadPoolExecutor(max_workers=max(1, len(collections))) as executor:
+        futures = {}
+        for collection in collections:
+            reader = STATS_DISPATCH.get(collection['db_table'])
+            if reader is not None:
+                futures[collection['name']] = executor.submit(
+                    reader, collection['db_path'], connections)
+
+        for collection in collections:
+            name = collection['name']
+            print(f"  Reading {name} database...")
+
+            future = futures.get(name)
+            if future is None:
+                print(f"    Warning: Unknown collection type '{collection['db_table']}'")
+                stats = {'available': False}
+            else:
+                stats = future.result()
+                if 'error' in stats:
+                    print(f"Warning: {stats['error']}")
+
+            collections_stats[name] = stats
+
+            if stats['available']:
+                print(f"    ✓ Found {stats.get('total_count', 0)} items")
+            else:
+                print(f"    ⚠ Database not available")
 
     # Calculate aggregate statistics
     aggregate_stats = calculate_aggregate_stats(collections_stats)
@@ -834,20 +1005,26 @@ def generate_site(config, force=False):
     output_dir = config['site']['output_dir']
     os.makedirs(output_dir, exist_ok=True)
 
+    # Write to a uniquely named temporary file and swap it in, so readers and
+    # overlapping runs never see a partial page
     output_path = os.path.join(output_dir, 'index.html')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    data = html.encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix='.index.html.', suffix='.tmp')
+    try:
+        with open(fd, 'wb', buffering=1 << 20) as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
     # Save state
-    individual_hashes = {}
-    for collection in collections:
-        name = collection['name']
-        db_path = collection['db_path']
-        individual_hashes[name] = get_db_hash(db_path)
-
     new_state = {
+        'state_version': STATE_VERSION,
         'last_generated': datetime.now().isoformat(),
         'databases_hash': current_hash,
+        'content_hash': content_hash,
         'individual_hashes': individual_hashes
     }
     save_state(new_state)
@@ -861,6 +1038,33 @@ def generate_site(config, force=False):
     return True
 
 
+def watch_site(config, interval, force=False, verify_hash=False):
+    """Regenerate the site whenever a database fingerprint changes.
+
+    Keeps the configuration and database connections loaded between
+    regenerations; runs until interrupted.
+    """
+    collections = config['collections']
+    connections = {}
+    last_hash, _ = get_combined_hash(collections)
+
+    try:
+        generate_site(config, force=force, verify_hash=verify_hash, connections=connections)
+        print(f"\nWatching databases every {interval:g}s (Ctrl+C to stop)...")
+        while True:
+            time.sleep(interval)
+            current_hash, _ = get_combined_hash(collections)
+            if current_hash != last_hash:
+                print()
+                generate_site(config, verify_hash=verify_hash, connections=connections)
+                last_hash = current_hash
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        for _, conn in connections.values():
+            conn.close()
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -869,14 +1073,23 @@ def main():
     )
     parser.add_argument('--force', '-f', action='store_true',
                        help='Force regeneration even if databases unchanged')
+    parser.add_argument('--verify-hash', action='store_true',
+                       help='Detect changes by hashing database contents instead of mtime/size')
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                       help='Keep running and regenerate when databases change, checking every SECONDS')
 
     args = parser.parse_args()
+    if args.watch is not None and args.watch <= 0:
+        parser.error('--watch interval must be positive')
 
     # Load configuration
     config = load_config()
 
     # Generate site
-    generate_site(config, force=args.force)
+    if args.watch is not None:
+        watch_site(config, args.watch, force=args.force, verify_hash=args.verify_hash)
+    else:
+        generate_site(config, force=args.force, verify_hash=args.verify_hash)
 
 
 if __name__ == '__main__':